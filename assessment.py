@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import boto3
+import argparse
+import functools
+import hashlib
+import logging
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+
+import jsonio
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger("storybook.assessment")
+
+# Connections kept per client unless a caller needs more for its worker threads
+CLIENT_POOL_CONNECTIONS = 50
+
+# Connection pool shared by every caller in this process, with throttling-aware retries
+_CLIENT_CONFIG = Config(
+    max_pool_connections=CLIENT_POOL_CONNECTIONS,
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    tcp_keepalive=True
+)
+
+# Above this many assessments the JSON is streamed to disk rather than built in memory
+STREAM_ASSESSMENTS_MIN = 1000
+
+# Assessment JSON larger than this is zstd-compressed when zstandard is installed
+ZSTD_MIN_BYTES = 1 << 20
+
+# Chunks assessed concurrently by default, and the most the app requests: every worker
+# runs a Bedrock model call, so this stays below the chunk processing worker count
+ASSESS_MAX_WORKERS = 16
+
+# Set to 1 to also write an indented copy of the assessments for reading by hand
+DEBUG_PRETTY_ENV = "BEDROCK_DEBUG_PRETTY"
+
+@functools.lru_cache(maxsize=None)
+def _get_session(region: str) -> boto3.Session:
+    """Get the shared boto3 session for a region."""
+    return boto3.Session(region_name=region)
+
+@functools.lru_cache(maxsize=None)
+def _get_client(region: str, service: str, max_pool_connections: int = CLIENT_POOL_CONNECTIONS):
+    """Get the shared client for an AWS service in a region with a given connection pool size."""
+    config = _CLIENT_CONFIG
+    if max_pool_connections > CLIENT_POOL_CONNECTIONS:
+        config = config.merge(Config(max_pool_connections=max_pool_connections))
+    return _get_session(region).client(service, config=config)
+
+def assess_chunk(chunk_text: str, model_id: str, region: str,
+                 max_pool_connections: int = CLIENT_POOL_CONNECTIONS) -> str:
+    """Assess a single chunk of text using a specified model.
+
+    Args:
+        chunk_text: The text chunk to assess
+        model_id: The Bedrock model ID to use
+        region: AWS region name
+        max_pool_connections: Connection pool size of the shared client; at least
+            the number of threads calling concurrently
+
+    Returns:
+        Assessment results as a string
+    """
+    bedrock = _get_client(region, 'bedrock', max(max_pool_connections, CLIENT_POOL_CONNECTIONS))
+
+    response = bedrock.invoke_model(
+        modelId=model_id,
+        contentType='text/plain',
+        content=chunk_text
+    )
+
+    return response['body'].read().decode('utf-8')
+
+def _fdatasync(fd: int) -> None:
+    """Flush file data to disk, skipping the metadata-only sync where supported."""
+    if hasattr(os, 'fdatasync'):
+        os.fdatasync(fd)
+    else:
+        os.fsync(fd)
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write a whole buffer to a raw file descriptor, retrying short writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+def serialize_assessments(assessments: List[str]) -> bytes:
+    """Encode assessments as compact JSON in a single buffer.
+
+    Args:
+        assessments: Assessment results, one per chunk
+
+    Returns:
+        UTF-8 encoded JSON document
+    """
+    return jsonio.dumps(assessments)
+
+def _zstd_compressor():
+    """Create a compressor for assessment files, using all cores."""
+    return zstandard.ZstdCompressor(level=3, threads=-1)
+
+def write_assessments(assessment_file: str, assessments: List[str]) -> str:
+    """Write assessments to a compact JSON file.
+
+    The file is written under a temporary name, flushed to disk once and then
+    renamed into place, so readers never see a partially written file. All
+    file operations go through one descriptor for the target directory, which
+    is synced afterwards so the rename survives a crash. Large assessment
+    lists are encoded incrementally through a 1 MiB write buffer so the whole
+    document is never held in memory at once. When zstandard is
+    installed, large documents are written compressed to ``<file>.zst``
+    instead; use find_assessment_file() and load_assessments() to read either.
+    Setting BEDROCK_DEBUG_PRETTY=1 also writes an indented ``.pretty.json`` copy.
+
+    Args:
+        assessment_file: Path of the JSON file to write
+        assessments: Assessment results, one per chunk
+
+    Returns:
+        Path of the file actually written
+    """
+    stream = len(assessments) > STREAM_ASSESSMENTS_MIN
+    payload = None if stream else serialize_assessments(assessments)
+    compress = zstandard is not None and (stream or len(payload) > ZSTD_MIN_BYTES)
+
+    directory, name = os.path.split(assessment_file)
+    target = f"{name}.zst" if compress else name
+    stale = name if compress else f"{name}.zst"
+    tmp_file = f"{target}.tmp.{os.getpid()}"
+
+    # Resolve the directory once; every later call is relative to its descriptor
+    dir_fd = None
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory or '.', os.O_RDONLY | os.O_DIRECTORY)
+    else:
+        target, stale, tmp_file = (os.path.join(directory, n) for n in (target, stale, tmp_file))
+
+    def opener(path, flags):
+        return os.open(path, flags, 0o644, dir_fd=dir_fd)
+
+    try:
+        try:
+            if stream:
+                # Same bytes as the orjson path: compact, with non-ASCII text kept as UTF-8
+                encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+                with open(tmp_file, 'wb', buffering=1 << 20, opener=opener) as f:
+                    if compress:
+                        with _zstd_compressor().stream_writer(f, closefd=False) as writer:
+                            for piece in encoder.iterencode(assessments):
+                                writer.write(piece.encode('utf-8'))
+                    else:
+                        for piece in encoder.iterencode(assessments):
+                            f.write(piece.encode('utf-8'))
+                    f.flush()
+                    _fdatasync(f.fileno())
+            else:
+                if compress:
+                    payload = _zstd_compressor().compress(payload)
+                fd = opener(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+                try:
+                    _write_all(fd, payload)
+                    _fdatasync(fd)
+                finally:
+                    os.close(fd)
+
+            os.replace(tmp_file, target, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+        except BaseException:
+            try:
+                os.remove(tmp_file, dir_fd=dir_fd)
+            except FileNotFoundError:
+                pass
+            raise
+
+        # Drop the copy in the other format so readers cannot pick up stale results
+        try:
+            os.remove(stale, dir_fd=dir_fd)
+        except FileNotFoundError:
+            pass
+
+        # Make the rename itself durable
+        if dir_fd is not None:
+            os.fsync(dir_fd)
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+
+    if os.environ.get(DEBUG_PRETTY_ENV) == "1":
+        pretty_file = f"{os.path.splitext(assessment_file)[0]}.pretty.json"
+        with open(pretty_file, 'w', encoding='utf-8') as f:
+            json.dump(assessments, f, indent=2)
+
+    return os.path.join(directory, os.path.basename(target))
+
+def find_assessment_file(chunks_dir: str, project_name: str) -> Optional[str]:
+    """Find a project's assessment file, plain or zstd-compressed.
+
+    Args:
+        chunks_dir: Directory containing manuscript chunks
+        project_name: Project name
+
+    Returns:
+        Path of the assessment file, or None if there is none
+    """
+    assessment_file = os.path.join(chunks_dir, f"{project_name}_assessment.json")
+    for path in (assessment_file, f"{assessment_file}.zst"):
+        if os.path.isfile(path):
+            return path
+    return None
+
+def load_assessments(path: str) -> Any:
+    """Load an assessment file written by write_assessments().
+
+    Args:
+        path: Path of the plain or ``.zst`` assessment file
+
+    Returns:
+        Parsed assessment data
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if path.endswith('.zst'):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {path}")
+        data = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+    return jsonio.loads(data)
+
+def assessments_etag(assessments: List[str]) -> str:
+    """Fingerprint assessment results without encoding them as JSON a second time.
+
+    Args:
+        assessments: Assessment results, one per chunk
+
+    Returns:
+        16 character hex digest of the assessments
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for assessment in assessments:
+        digest.update(assessment.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def _mark_assessed(region: str, table_prefix: str, project_name: str, now_iso: str,
+                   etag: str) -> None:
+    """Move a project to the improvement phase, raising RuntimeError on failure."""
+    state_table = f"{table_prefix}_{project_name}_state"
+
+    try:
+        # Low-level client with pre-marshalled values; no resource-layer serialization
+        _get_client(region, 'dynamodb').update_item(
+            TableName=state_table,
+            Key={
+                "manuscript_id": {"S": project_name},
+                "chunk_id": {"S": "metadata"}
+            },
+            UpdateExpression="SET current_phase = :p, updated_at = :u, assessment_etag = :e",
+            ConditionExpression=(
+                "attribute_not_exists(current_phase) OR current_phase <> :p "
+                "OR attribute_not_exists(assessment_etag) OR assessment_etag <> :e"
+            ),
+            ExpressionAttributeValues={
+                ":p": {"S": "improvement"},
+                ":u": {"S": now_iso},
+                ":e": {"S": etag}
+            }
+        )
+    except ClientError as e:
+        # Already in the improvement phase with these results, e.g. when the assessment is retried
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            logger.error(f"Error updating DynamoDB: {str(e)}")
+            raise RuntimeError("DynamoDB update failed") from e
+    except Exception as e:
+        logger.error(f"Error updating DynamoDB: {str(e)}")
+        raise RuntimeError("DynamoDB update failed") from e
+
+def assess_manuscript(chunks_dir: str, project_name: str, region: str, model_id: str,
+                      table_prefix: str, chunk_files: Optional[List[str]] = None,
+                      max_workers: int = ASSESS_MAX_WORKERS) -> None:
+    """Assess every chunk of a manuscript and move the project to the improvement phase.
+
+    Args:
+        chunks_dir: Directory containing manuscript chunks
+        project_name: Project name
+        region: AWS region name
+        model_id: The Bedrock model ID to use
+        table_prefix: DynamoDB table prefix
+        chunk_files: Chunk file paths; read from the chunk metadata file when omitted
+        max_workers: Number of chunks assessed concurrently
+
+    Raises:
+        RuntimeError: If the project state could not be updated
+        OSError: If the assessment file could not be written
+    """
+    chunks_dir = os.fspath(chunks_dir).rstrip('/')
+
+    # Fail before any model calls if the assessment file has nowhere to go
+    if not os.path.isdir(chunks_dir):
+        raise FileNotFoundError(f"Chunks directory not found: {chunks_dir}")
+
+    # Load chunk metadata
+    if chunk_files is None:
+        metadata_file = f"{chunks_dir}/{project_name}_metadata.json"
+        with open(metadata_file, 'rb') as f:
+            metadata = jsonio.loads(f.read())
+
+        chunk_files = metadata['chunk_files']
+
+    # Every worker thread gets a connection from the shared client's pool
+    workers = max(1, min(max_workers, len(chunk_files)))
+
+    def assess_file(chunk_file: str) -> str:
+        with open(chunk_file, 'r', encoding='utf-8') as f:
+            chunk_text = f.read()
+        return assess_chunk(chunk_text, model_id, region, workers)
+
+    # Assess chunks concurrently, keeping the results in chunk order
+    assessments = []
+    if chunk_files:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            assessments = list(executor.map(assess_file, chunk_files))
+
+    # Stamp the project when the assessments are done, not when the run started
+    now_iso = datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+    # Save assessments to file while DynamoDB is updated with the assessment results
+    assessment_file = f"{chunks_dir}/{project_name}_assessment.json"
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        write = executor.submit(write_assessments, assessment_file, assessments)
+        update = executor.submit(_mark_assessed, region, table_prefix, project_name, now_iso,
+                                 assessments_etag(assessments))
+        write.result()
+        update.result()
+
+def main():
+    """Main entry point for manuscript assessment script."""
+    parser = argparse.ArgumentParser(description='Assess manuscript chunks')
+    parser.add_argument('--chunks_dir', required=True, help='Directory containing manuscript chunks')
+    parser.add_argument('--project_name', required=True, help='Project name')
+    parser.add_argument('--region', required=True, help='AWS region')
+    parser.add_argument('--model_id', required=True, help='Model ID for assessment')
+    parser.add_argument('--table_prefix', required=True, help='DynamoDB table prefix')
+
+    args = parser.parse_args()
+
+    try:
+        assess_manuscript(args.chunks_dir, args.project_name, args.region,
+                          args.model_id, args.table_prefix)
+    except RuntimeError:
+        sys.exit(1)
+    except OSError as e:
+        logger.error(f"Error during assessment: {str(e)}")
+        sys.exit(1)
+
+    print("Manuscript assessment complete")
+
+if __name__ == "__main__":
+    main()
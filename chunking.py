@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+import os
+import json
+import re
+import argparse
+import bisect
+import functools
+import itertools
+import multiprocessing
+from typing import Dict, List, Any
+
+import jsonio
+
+# Common chapter patterns: "Chapter 12" / "Chapter XII" in any case, "12. ",
+# and upper-case "CHAPTER 12" / "CHAPTER XII" after leading whitespace
+_CHAPTER_RE = re.compile(
+    r'^(?:(?i:chapter\s+(?:\d+|[IVXLCDM]+))|\d+\.\s+|\s*CHAPTER\s+(?:\d+|[IVXLCDM]+))',
+    re.MULTILINE
+)
+
+# Below this many characters a worker pool costs more than it saves
+PARALLEL_TOKENIZE_MIN_CHARS = 500_000
+
+# Texts longer than this many characters per token of budget skip the
+# single-chunk check in chunk_text; English averages about four
+SHORT_TEXT_CHARS_PER_TOKEN = 8
+
+@functools.lru_cache(maxsize=None)
+def get_encoding(encoding_name: str = "cl100k_base") -> "tiktoken.Encoding":
+    """Load a tokenizer encoding once and reuse it for every call."""
+    import tiktoken
+    return tiktoken.get_encoding(encoding_name)
+
+def count_tokens(text: str, encoding_name: str = "cl100k_base") -> int:
+    """Count the number of tokens in a text string.
+
+    Args:
+        text: The text to tokenize
+        encoding_name: Name of the tokenizer encoding to use
+
+    Returns:
+        Number of tokens in the text
+    """
+    return len(get_encoding(encoding_name).encode(text))
+
+def count_tokens_batch(texts: List[str], encoding_name: str = "cl100k_base") -> List[int]:
+    """Count the tokens in each of several text strings with one batched encode.
+
+    The batch is encoded on one tokenizer thread per CPU.
+
+    Args:
+        texts: The texts to tokenize
+        encoding_name: Name of the tokenizer encoding to use
+
+    Returns:
+        Number of tokens in each text, in order
+    """
+    encoded = get_encoding(encoding_name).encode_ordinary_batch(texts, num_threads=os.cpu_count() or 1)
+    return [len(tokens) for tokens in encoded]
+
+@functools.lru_cache(maxsize=None)
+def get_sentence_tokenizer(language: str = "english"):
+    """Load the Punkt sentence tokenizer once and reuse it for every call."""
+    try:
+        # nltk 3.8.2+ ships Punkt parameters as punkt_tab rather than pickles
+        from nltk.tokenize import PunktTokenizer
+    except ImportError:
+        import nltk
+        return nltk.data.load(f"tokenizers/punkt/{language}.pickle")
+    return PunktTokenizer(language)
+
+def _punkt_resource() -> str:
+    """Name of the nltk data package the sentence tokenizer loads."""
+    try:
+        from nltk.tokenize import PunktTokenizer
+    except ImportError:
+        return 'punkt'
+    return 'punkt_tab'
+
+@functools.lru_cache(maxsize=None)
+def ensure_punkt() -> None:
+    """Download the Punkt sentence tokenizer data if missing, at most once per process."""
+    import nltk
+    resource = _punkt_resource()
+    try:
+        nltk.data.find(f'tokenizers/{resource}')
+    except LookupError:
+        nltk.download(resource, quiet=True)
+
+def tokenize_sentences(text: str) -> List[str]:
+    """Split a single piece of text into sentences with the cached tokenizer."""
+    return get_sentence_tokenizer().tokenize(text)
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences, tokenizing chapters in parallel for long texts.
+
+    Args:
+        text: The text to split
+
+    Returns:
+        Sentences in text order
+    """
+    processes = multiprocessing.cpu_count()
+    if len(text) < PARALLEL_TOKENIZE_MIN_CHARS or processes < 2:
+        return tokenize_sentences(text)
+
+    # Sentences do not run across chapter headings, so chapters can be split independently
+    bounds = [0] + [pos for pos, _ in detect_chapters(text) if pos > 0] + [len(text)]
+    sections = [text[start:end] for start, end in zip(bounds, bounds[1:]) if start < end]
+    if len(sections) < 2:
+        return tokenize_sentences(text)
+
+    # Spawned rather than forked workers: the calling process may already run boto3 and
+    # worker threads, which a fork can deadlock on. Each worker loads Punkt once up front.
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(min(processes, len(sections)), initializer=get_sentence_tokenizer) as pool:
+        return list(itertools.chain.from_iterable(pool.map(tokenize_sentences, sections)))
+
+def sentence_offsets(text: str, sentences: List[str]) -> List[int]:
+    """Find where each sentence starts in the text it was split from.
+
+    Args:
+        text: The text the sentences were split from
+        sentences: Sentences in text order
+
+    Returns:
+        Character offset of each sentence in text
+    """
+    offsets = []
+    cursor = 0
+    for sentence in sentences:
+        pos = text.find(sentence, cursor)
+        if pos == -1:
+            # The tokenizer altered the sentence; keep the running position
+            pos = cursor
+        else:
+            cursor = pos + len(sentence)
+        offsets.append(pos)
+    return offsets
+
+def _chunk_ranges(sentences, max_tokens, overlap_tokens):
+    """Pick the [start, end) sentence range and token count of each chunk."""
+    # Running token totals: prefix[k] is the token count of sentences[:k]
+    prefix = [0]
+    prefix.extend(itertools.accumulate(count_tokens_batch(sentences)))
+    total_sentences = len(sentences)
+
+    ranges = []
+    start = 0
+    next_sentence = 1
+
+    while True:
+        # Find the first sentence that would push the chunk past max tokens
+        end = bisect.bisect_right(prefix, prefix[start] + max_tokens, next_sentence + 1) - 1
+        if end >= total_sentences:
+            break
+
+        # Save the current chunk
+        ranges.append((start, end, prefix[end] - prefix[start]))
+
+        # Start a new chunk with as many trailing sentences as fit in the overlap
+        start = bisect.bisect_left(prefix, prefix[end] - overlap_tokens, start, end)
+        next_sentence = end + 1
+
+    # Add the last chunk
+    ranges.append((start, total_sentences, prefix[total_sentences] - prefix[start]))
+
+    return ranges
+
+def _single_chunk_tokens(text, max_tokens):
+    """Return the token count of text if it fits in one chunk, otherwise None."""
+    # Only texts short enough to plausibly fit are worth encoding whole
+    if text and len(text) <= max_tokens * SHORT_TEXT_CHARS_PER_TOKEN:
+        tokens = count_tokens_batch([text])[0]
+        if tokens <= max_tokens:
+            return tokens
+    return None
+
+def chunk_text(text, max_tokens=8000, overlap_tokens=500):
+    """Split text into chunks of approximately max_tokens with overlap.
+
+    Each chunk is a verbatim slice of the text, running from the start of its
+    first sentence to the end of its last, so paragraph breaks are kept. Text
+    that fits in one chunk is returned stripped, without sentence tokenization,
+    which is the same slice.
+    """
+    text = text.strip()
+    if _single_chunk_tokens(text, max_tokens) is not None:
+        return [text]
+    return chunk_text_with_offsets(text, max_tokens, overlap_tokens)[0]
+
+def _plan_chunks(text, max_tokens, overlap_tokens):
+    """Split text into sentences and pick chunk ranges without building chunk strings.
+
+    Returns the sentences, each chunk's (start, end, tokens) sentence range and
+    each chunk's (start, end) character span in text.
+    """
+    # First split into sentences
+    sentences = split_sentences(text)
+    if not sentences:
+        return [], [], []
+
+    starts = sentence_offsets(text, sentences)
+    ranges = _chunk_ranges(sentences, max_tokens, overlap_tokens)
+    offsets = [(starts[start], starts[end - 1] + len(sentences[end - 1])) for start, end, _ in ranges]
+    return sentences, ranges, offsets
+
+def chunk_text_with_offsets(text, max_tokens=8000, overlap_tokens=500):
+    """Split text into chunks as chunk_text does, keeping what the chunker knows about each.
+
+    Returns the chunks, each chunk's (start, end) character span in text, and
+    each chunk's token count as summed from its sentences.
+    """
+    _, ranges, offsets = _plan_chunks(text, max_tokens, overlap_tokens)
+    chunks = [text[start:end] for start, end in offsets]
+    return chunks, offsets, [tokens for _, _, tokens in ranges]
+
+def detect_chapters(text):
+    """Identify chapter breaks in the text."""
+    # Single scan in text order over all chapter patterns
+    return [(match.start(), match.group()) for match in _CHAPTER_RE.finditer(text)]
+
+def _chapter_groups(text, chunk_offsets, chunk_lengths, max_tokens):
+    """Group chunk indexes so a chunk with a chapter marker near its end absorbs the next chunk."""
+    chapter_markers = detect_chapters(text)
+    if not chapter_markers:
+        return [(i,) for i in range(len(chunk_lengths))]  # No chapters detected
+
+    # Find the chapter markers inside each chunk; markers are already in text order
+    marker_positions = [pos for pos, _ in chapter_markers]
+    chapter_positions = []
+    for i, (chunk_start, chunk_end) in enumerate(chunk_offsets):
+        first = bisect.bisect_left(marker_positions, chunk_start)
+        last = bisect.bisect_left(marker_positions, chunk_end)
+        for pos in marker_positions[first:last]:
+            chapter_positions.append((i, pos - chunk_start))
+
+    # Chunks whose chapter marker is close to the end should merge with the next chunk
+    merge_with_next = {
+        chunk_idx for chunk_idx, pos_in_chunk in chapter_positions[:-1]
+        if pos_in_chunk > (chunk_offsets[chunk_idx][1] - chunk_offsets[chunk_idx][0]) * 0.7
+    }
+
+    # Group the chunks in one pass; a merged chunk is not merged again
+    groups = []
+    i = 0
+    while i < len(chunk_lengths):
+        if (i in merge_with_next and i < len(chunk_lengths) - 1
+                and chunk_lengths[i] + chunk_lengths[i + 1] < max_tokens * 1.3):
+            groups.append((i, i + 1))
+            i += 2
+        else:
+            groups.append((i,))
+            i += 1
+
+    return groups
+
+def preserve_chapter_integrity(text, chunks, chunk_offsets, token_counts, max_tokens):
+    """Adjust chunk boundaries to avoid breaking up chapters.
+
+    chunk_offsets and token_counts are as returned by chunk_text_with_offsets.
+    Returns the adjusted chunks and their token counts.
+    """
+    groups = _chapter_groups(text, chunk_offsets, [len(chunk) for chunk in chunks], max_tokens)
+    modified_chunks = ["".join(chunks[i] for i in group) for group in groups]
+    modified_counts = [sum(token_counts[i] for i in group) for group in groups]
+    return modified_chunks, modified_counts
+
+def save_chunks(chunks, output_dir, project_name, token_counts=None):
+    """Save chunks to individual files, counting their tokens unless counts are given.
+
+    Chunks may be any iterable and are written as they arrive. Counts are taken by
+    encoding each whole chunk, so they are exact rather than sums over sentences.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    chunk_files = []
+    counts = []
+
+    for i, chunk in enumerate(chunks):
+        file_path = os.path.join(output_dir, f"{project_name}_chunk_{i+1:04d}.txt")
+        # Encode once and write in binary mode, skipping the text layer
+        with open(file_path, 'wb') as f:
+            f.write(chunk.encode('utf-8'))
+        chunk_files.append(file_path)
+        if token_counts is None:
+            counts.extend(count_tokens_batch([chunk]))
+
+    if token_counts is None:
+        token_counts = counts
+
+    # Create metadata file
+    metadata = {
+        "project_name": project_name,
+        "total_chunks": len(chunk_files),
+        "chunk_files": chunk_files,
+        "token_counts": token_counts
+    }
+
+    metadata_file = os.path.join(output_dir, f"{project_name}_metadata.json")
+    with open(metadata_file, 'wb') as f:
+        f.write(jsonio.dumps(metadata, indent=True))
+
+    return metadata
+
+@functools.lru_cache(maxsize=1)
+def _load_config(config_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse the application config, reusing it until the file is modified."""
+    return jsonio.load_file(config_path)
+
+def chunk_manuscript(manuscript_path: str, output_dir: str, project_name: str,
+                     max_tokens: int = 8000, overlap_tokens: int = 500) -> Dict[str, Any]:
+    """Split a manuscript file into chunks and save them with their metadata.
+
+    As with chunk_text, chunks are verbatim slices of the manuscript, and a
+    manuscript that fits in one chunk is saved whole apart from surrounding
+    whitespace. The token counts in the metadata are exact per saved chunk.
+
+    Args:
+        manuscript_path: Path to the manuscript file
+        output_dir: Directory to save chunks
+        project_name: Project name used to prefix chunk files
+        max_tokens: Maximum tokens per chunk
+        overlap_tokens: Token overlap between chunks
+
+    Returns:
+        Chunk metadata as written to the metadata file
+    """
+    # Read manuscript
+    with open(manuscript_path, 'r', encoding='utf-8') as f:
+        manuscript_text = f.read()
+
+    # A manuscript that fits in one chunk needs neither Punkt nor sentence splitting
+    single_text = manuscript_text.strip()
+    single_tokens = _single_chunk_tokens(single_text, max_tokens)
+    if single_tokens is not None:
+        return save_chunks([single_text], output_dir, project_name, [single_tokens])
+    del single_text
+
+    # Install nltk punkt if needed
+    ensure_punkt()
+
+    # Chunk the text as sentence ranges; chunk strings are only sliced out when written
+    chunk_offsets = _plan_chunks(manuscript_text, max_tokens, overlap_tokens)[2]
+
+    # Preserve chapter integrity when possible
+    chunk_lengths = [end - start for start, end in chunk_offsets]
+    groups = _chapter_groups(manuscript_text, chunk_offsets, chunk_lengths, max_tokens)
+
+    # Save chunks one at a time; each is re-encoded for its exact token count, since
+    # the sentence sums used for windowing leave out the whitespace between sentences
+    refined_chunks = (
+        "".join(manuscript_text[chunk_offsets[i][0]:chunk_offsets[i][1]] for i in group)
+        for group in groups
+    )
+    return save_chunks(refined_chunks, output_dir, project_name)
+
+def main():
+    """Main entry point for the manuscript chunking script."""
+    parser = argparse.ArgumentParser(description='Split manuscript into chunks for processing')
+    parser.add_argument('manuscript_path', help='Path to manuscript file')
+    parser.add_argument('--output_dir', default='./chunks', help='Directory to save chunks')
+    parser.add_argument('--project_name', required=True, help='Project name')
+    parser.add_argument('--max_tokens', type=int, default=8000, help='Maximum tokens per chunk')
+    parser.add_argument('--overlap_tokens', type=int, default=500, help='Token overlap between chunks')
+
+    args = parser.parse_args()
+
+    # Load config to get parameters
+    config_path = "./config.json"
+    try:
+        config = _load_config(config_path, os.stat(config_path).st_mtime_ns)
+        max_tokens = config.get('chunk_size', args.max_tokens)
+        overlap_tokens = config.get('chunk_overlap', args.overlap_tokens)
+    except (OSError, ValueError):
+        max_tokens = args.max_tokens
+        overlap_tokens = args.overlap_tokens
+
+    metadata = chunk_manuscript(args.manuscript_path, args.output_dir, args.project_name,
+                                max_tokens, overlap_tokens)
+
+    print(f"Manuscript split into {metadata['total_chunks']} chunks. Metadata saved.")
+    print(json.dumps(metadata))
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 import os
+import copy
 import json
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 
 def configure_logging() -> None:
     """
@@ -42,6 +43,10 @@ def __init__(self) -> None:
         self.DEFAULT_CHUNK_SIZE = 8000
         self.DEFAULT_OVERLAP = 500
         
+        # Concurrency default (chunk processing is network bound); only written to
+        # the config file when changed, so it follows the machine it runs on
+        self.DEFAULT_MAX_PARALLEL = max(32, (os.cpu_count() or 1) * 5)
+        
         # Create required directories
         for directory in [self.TEMP_DIR, self.FLOW_TEMPLATES_DIR, 
                          self.MANUSCRIPT_DIR, self.CHUNKS_DIR, self.RESEARCH_DIR]:
@@ -143,7 +148,18 @@ def _load_config(self) -> None:
         """Load configuration values.""" 
         with open(self.CONFIG_FILE, 'r') as f:
             config = json.load(f)
-            
+        
+        self._dirty = False
+        self._section_keys = {}
+        self._apply_config(config)
+    
+    def _apply_config(self, config: Dict[str, Any]) -> None:
+        """
+        Apply a configuration dictionary to the instance attributes.
+
+        Args:
+            config: Full configuration dictionary
+        """
         # Load main configuration values
         self.aws_region = config.get('aws_region', self.DEFAULT_REGION)
         self.aws_profile = config.get('aws_profile', 'default')
@@ -152,19 +168,21 @@ def _load_config(self) -> None:
         self.table_prefix = config.get('table_prefix', self.DEFAULT_TABLE_PREFIX)
         self.chunk_size = config.get('chunk_size', self.DEFAULT_CHUNK_SIZE)
         self.chunk_overlap = config.get('chunk_overlap', self.DEFAULT_OVERLAP)
+        self.max_parallel = config.get('max_parallel', self.DEFAULT_MAX_PARALLEL)
         
         # Store the full config for reference
         self._config = config
     
     def get_config(self) -> Dict[str, Any]:
         """
-        Get the full configuration.
+        Get a copy of the full configuration, including changes not yet flushed to disk.
+
+        Changes to the copy are not applied; use update_config or update_many.
 
         Returns:
             Dict[str, Any]: Complete configuration dictionary.
         """
-        with open(self.CONFIG_FILE, 'r') as f:
-            return json.load(f)
+        return copy.deepcopy(self._config)
     
     def get_config_value(self, key: str, default: Any = None) -> Any:
         """
@@ -186,7 +204,8 @@ def get_config_value(self, key: str, default: Any = None) -> Any:
             else:
                 return default
         
-        return value
+        # Nested sections are copied so changes cannot bypass update_config
+        return copy.deepcopy(value)
     
     def get_config_section(self, section: str) -> Dict[str, Any]:
         """
@@ -196,58 +215,88 @@ def get_config_section(self, section: str) -> Dict[str, Any]:
             section: Section name to retrieve
 
         Returns:
-            Dict[str, Any]: Configuration section or empty dict if not found.
+            Dict[str, Any]: Copy of the configuration section or empty dict if not found.
         """
-        with open(self.CONFIG_FILE, 'r') as f:
-            config = json.load(f)
-        
-        return config.get(section, {})
+        return copy.deepcopy(self._config.get(section, {}))
+    
+    def get_section_keys(self, section: str) -> Tuple[str, ...]:
+        """
+        Get the sorted keys of a configuration section.
+
+        The result is cached until the section is written to.
+
+        Args:
+            section: Section name to retrieve keys for
+
+        Returns:
+            Tuple[str, ...]: Sorted section keys.
+        """
+        keys = self._section_keys.get(section)
+        if keys is None:
+            keys = tuple(sorted(self._config.get(section, {})))
+            self._section_keys[section] = keys
+        return keys
     
     def update_config(self, key: str, value: Any) -> None:
         """
-        Update a specific configuration value using dot notation.
+        Update a specific configuration value using dot notation and save it.
 
         Args:
             key: Configuration key using dot notation (e.g., 'aws.region')
             value: New value to set
         """
-        with open(self.CONFIG_FILE, 'r') as f:
-            config = json.load(f)
-        
-        keys = key.split('.')
-        current = config
-        
-        # Navigate to the right level
-        for k in keys[:-1]:
-            if k not in current:
-                current[k] = {}
-            current = current[k]
-        
-        # Update the value
-        current[keys[-1]] = value
-        
-        # Save the updated config
-        with open(self.CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=4)
+        self.update_many({key: value})
+        self.flush()
+    
+    def update_many(self, updates: Dict[str, Any]) -> None:
+        """
+        Update several configuration values in memory without saving them.
+
+        Changes are written to the configuration file by the next call to
+        flush() (or to any method that saves immediately).
+
+        Args:
+            updates: Mapping of dot notation keys to new values
+        """
+        for key, value in updates.items():
+            keys = key.split('.')
+            current = self._config
+            
+            # Navigate to the right level
+            for k in keys[:-1]:
+                if k not in current:
+                    current[k] = {}
+                current = current[k]
+            
+            # Any write under a section may change its keys
+            self._section_keys.pop(keys[0], None)
+            
+            # Update the value
+            current[keys[-1]] = value
         
-        # Reload config
-        self._load_config()
+        self._dirty = True
+        self._apply_config(self._config)
     
     def update_config_section(self, section: str, data: Dict[str, Any]) -> None:
         """
-        Update an entire configuration section.
+        Update an entire configuration section and save it.
 
         Args:
             section: Section name to update
             data: New section data
         """
-        with open(self.CONFIG_FILE, 'r') as f:
-            config = json.load(f)
-        
-        config[section] = data
+        self._config[section] = data
+        self._section_keys.pop(section, None)
+        self._dirty = True
+        self._apply_config(self._config)
+        self.flush()
+    
+    def flush(self) -> None:
+        """Write pending configuration changes to the configuration file."""
+        if not self._dirty:
+            return
         
         with open(self.CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=4)
+            json.dump(self._config, f, indent=4)
         
-        # Reload config
-        self._load_config()
+        self._dirty = False
@@ -0,0 +1,48 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def loads(data: bytes) -> Any:
+    """Parse a JSON document, using orjson when it is installed.
+
+    Args:
+        data: UTF-8 encoded JSON document
+
+    Returns:
+        The parsed data
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def load_file(path: str) -> Any:
+    """Read and parse a JSON file in one pass over its bytes.
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        The parsed data
+    """
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+def dumps(data: Any, indent: bool = False) -> bytes:
+    """Encode data as JSON, using orjson when it is installed.
+
+    Args:
+        data: Data to encode
+        indent: Indent with two spaces instead of writing compact JSON
+
+    Returns:
+        UTF-8 encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
@@ -7,6 +7,12 @@
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
+# Enable line editing and history for input() prompts (not available on Windows)
+try:
+    import readline  # pylint: disable=unused-import
+except ImportError:
+    pass
+
 # Import modules
 from config import StorybookConfig, configure_logging
 from iam import IAMManager
@@ -19,6 +25,26 @@
 configure_logging()
 logger = logging.getLogger("storybook")
 
+# Static console text for the main menu, built once at import time
+_CLEAR_COMMAND = 'cls' if os.name == 'nt' else 'clear'
+_HEADER = (
+    "=========================================\n"
+    "   storybook - Bedrock Novel Editor     \n"
+    "=========================================\n"
+)
+_MAIN_MENU = (
+    "\nMain Menu:\n"
+    "1) Create New Manuscript Project\n"
+    "2) Process Existing Manuscript\n"
+    "3) Conduct Research\n"
+    "4) Remove Manuscript Project\n"
+    "5) Modify Configuration (Models, Thresholds)\n"
+    "6) AWS Configuration\n"
+    "q) Quit\n"
+)
+_PROMPT = "Enter your choice: "
+_QUIT_CHOICES = frozenset({"q", "Q"})
+
 class Storybook:
     """Main storybook application class."""
     
@@ -31,6 +57,16 @@ def __init__(self):
         self.manuscript_processor = ManuscriptProcessor(self.config)
         self.research_manager = ResearchManager(self.config)
         
+        # Main menu dispatch table
+        self._actions = {
+            "1": self.create_deployment,
+            "2": self.process_manuscript,
+            "3": self.conduct_research,
+            "4": self.remove_deployment,
+            "5": self.modify_configuration,
+            "6": self.configure_aws
+        }
+        
         # Create required directories
         for directory in [
             self.config.TEMP_DIR, 
@@ -444,6 +480,7 @@ def modify_configuration(self) -> None:
                 self._toggle_features()
                 
             elif config_choice == "0":
+                self.config.flush()
                 print("Returning to main menu...")
                 break
                 
@@ -647,8 +684,7 @@ def _change_default_model(self) -> None:
         if apply_all.lower() == 'y':
             models = self.config.get_config_section('models')
             
-            for agent in models:
-                self.config.update_config(f'models.{agent}', new_model)
+            self.config.update_many({f'models.{agent}': new_model for agent in models})
             
             print(f"Applied {new_model} to all agents.")
         
@@ -663,7 +699,7 @@ def _modify_agent_models(self) -> None:
         models = self.config.get_config_section('models')
         
         print("Current agent models:")
-        agents = sorted(models.keys())
+        agents = self.config.get_section_keys('models')
         for i, agent in enumerate(agents, 1):
             print(f"{i}) {agent}: {models[agent]}")
         
@@ -754,6 +790,7 @@ def _edit_chunking_settings(self) -> None:
         print("Current chunking settings:")
         print(f"1) Chunk size: {self.config.chunk_size} tokens")
         print(f"2) Chunk overlap: {self.config.chunk_overlap} tokens")
+        print(f"3) Parallel chunk workers: {self.config.max_parallel}")
         print("0) Cancel")
         
         setting_num = input("Enter setting to change: ")
@@ -774,6 +811,16 @@ def _edit_chunking_settings(self) -> None:
             except ValueError:
                 print("Invalid value. Must be a number.")
                 
+        elif setting_num == "3":
+            try:
+                new_parallel = int(input("Enter number of parallel chunk workers: "))
+                if new_parallel < 1:
+                    raise ValueError
+                self.config.update_config('max_parallel', new_parallel)
+                print(f"Parallel chunk workers updated to {new_parallel}.")
+            except ValueError:
+                print("Invalid value. Must be a positive number.")
+                
         elif setting_num == "0":
             print("Operation cancelled.")
             
@@ -788,7 +835,7 @@ def _toggle_features(self) -> None:
         settings = self.config.get_config_section('processing_settings')
         
         print("Current feature settings:")
-        features = sorted(settings.keys())
+        features = self.config.get_section_keys('processing_settings')
         for i, feature in enumerate(features, 1):
             print(f"{i}) {feature}: {settings[feature]}")
         
@@ -813,48 +860,34 @@ def _toggle_features(self) -> None:
         # Toggle value
         new_value = not current_value
         
-        # Update config
-        self.config.update_config(f'processing_settings.{feature_name}', new_value)
+        # Update config (saved when leaving the configuration menu)
+        self.config.update_many({f'processing_settings.{feature_name}': new_value})
         
         print(f"Feature '{feature_name}' toggled to {new_value}.")
 
     def run(self) -> None:
         """Run the storybook application."""
         # Clear screen and display header
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print("=========================================")
-        print("   storybook - Bedrock Novel Editor     ")
-        print("=========================================")
+        os.system(_CLEAR_COMMAND)
+        sys.stdout.write(_HEADER)
         
-        while True:
-            print("\nMain Menu:")
-            print("1) Create New Manuscript Project")
-            print("2) Process Existing Manuscript")
-            print("3) Conduct Research")
-            print("4) Remove Manuscript Project")
-            print("5) Modify Configuration (Models, Thresholds)")
-            print("6) AWS Configuration")
-            print("q) Quit")
-            
-            choice = input("Enter your choice: ")
-            
-            if choice == "1":
-                self.create_deployment()
-            elif choice == "2":
-                self.process_manuscript()
-            elif choice == "3":
-                self.conduct_research()
-            elif choice == "4":
-                self.remove_deployment()
-            elif choice == "5":
-                self.modify_configuration()
-            elif choice == "6":
-                self.configure_aws()
-            elif choice.lower() == "q":
-                print("Exiting. Goodbye!")
-                sys.exit(0)
-            else:
-                print("Invalid choice. Please try again.")
+        try:
+            while True:
+                sys.stdout.write(_MAIN_MENU)
+                
+                choice = input(_PROMPT)
+                action = self._actions.get(choice)
+                
+                if action:
+                    action()
+                elif choice in _QUIT_CHOICES:
+                    print("Exiting. Goodbye!")
+                    sys.exit(0)
+                else:
+                    print("Invalid choice. Please try again.")
+        finally:
+            # Save any configuration changes that are still pending
+            self.config.flush()
 
 
 if __name__ == "__main__":
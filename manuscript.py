@@ -1,18 +1,114 @@
 import os
+import sys
+import filecmp
 import re
-import json
 import logging
+import mmap
 import time
 import boto3
+from botocore.config import Config
 import shutil
-import subprocess
-import multiprocessing
-import tiktoken
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Callable, Iterator, Optional, Set, Tuple
+
+import chunking
+import assessment
+import jsonio
 
 logger = logging.getLogger("storybook.manuscript")
 
+# Block size for streaming chunk files into the combined manuscript
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Edit records stored per flush; the BatchWriteItem request limit
+EDIT_BATCH_SIZE = 25
+
+# Longest time completed edits wait before being recorded, in seconds
+EDIT_FLUSH_INTERVAL = 30
+
+# Attempts at recording a batch of edits before its chunks are reported as unrecorded
+EDIT_RECORD_ATTEMPTS = 3
+
+# Chunk number in a chunk ID such as chunk_0012
+_CHUNK_NUM_RE = re.compile(r'chunk_0*(\d+)')
+
+def _read_chunk_file(path: str) -> Optional[str]:
+    """Read a chunk file, logging and returning None if it cannot be read."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        logger.error(f"Error reading chunk file {path}: {str(e)}")
+        return None
+
+def _iter_flow_outputs(response: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+    """Yield (output name, content) pairs from an invoke_flow response as they arrive."""
+    stream = response.get('responseStream')
+    if stream is None:
+        for output in response.get('outputs', []):
+            yield output.get('name'), output.get('content')
+        return
+    
+    try:
+        for event in stream:
+            output = event.get('flowOutputEvent')
+            if output:
+                yield output.get('nodeName'), output.get('content', {}).get('document')
+    finally:
+        # Release the connection if the caller stops reading early
+        stream.close()
+
+def _append_file(infile, outfile) -> None:
+    """Append an open binary file to another, copying in the kernel on Linux."""
+    if sys.platform.startswith("linux"):
+        outfile.flush()
+        in_fd, out_fd = infile.fileno(), outfile.fileno()
+        offset = 0
+        try:
+            while True:
+                sent = os.sendfile(out_fd, in_fd, offset, COPY_BUFFER_SIZE)
+                if sent == 0:
+                    return
+                offset += sent
+        except OSError:
+            # Filesystem does not support sendfile; copy the rest in user space
+            infile.seek(offset)
+    shutil.copyfileobj(infile, outfile, COPY_BUFFER_SIZE)
+
+def _split_utf8(data, size: int) -> List[str]:
+    """Split UTF-8 bytes into decoded pieces of at most about size bytes.
+
+    Cuts prefer a paragraph break, then a sentence end, in the second half of
+    each window, and never fall inside a character.
+    """
+    pieces = []
+    total = len(data)
+    start = 0
+    while start < total:
+        end = min(start + size, total)
+        if end < total:
+            # Back off to the last paragraph or sentence boundary in the window
+            floor = start + size // 2
+            for boundary in (b"\n\n", b". "):
+                found = data.rfind(boundary, floor, end)
+                if found != -1:
+                    end = found + len(boundary)
+                    break
+        # Move the cut off any UTF-8 continuation bytes, backwards if possible
+        cut = end
+        while start < cut < total and (data[cut] & 0xC0) == 0x80:
+            cut -= 1
+        if cut > start:
+            end = cut
+        else:
+            while end < total and (data[end] & 0xC0) == 0x80:
+                end += 1
+        pieces.append(data[start:end].decode('utf-8', 'replace'))
+        start = end
+    return pieces
+
 class ManuscriptProcessor:
     """Handles manuscript processing operations."""
     
@@ -20,10 +116,79 @@ def __init__(self, config):
         """Initialize manuscript processor with configuration."""
         self.config = config
         
+        # AWS session and clients, created on first use
+        self._session = None
+        self._session_key = None
+        self._bedrock_agent_runtime = None
+        self._dynamodb = None
+        self._client_lock = threading.RLock()
+        
+        # Parsed JSON files keyed by path, with the (mtime, size) they were read at
+        self._json_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+        
         # Generate necessary Python scripts
         self._generate_chunking_script()
         self._generate_assessment_script()
     
+    @property
+    def session(self) -> boto3.Session:
+        """Shared boto3 session, rebuilt if the AWS region or profile changes."""
+        session_key = (self.config.aws_region, self.config.aws_profile)
+        with self._client_lock:
+            if self._session is None or self._session_key != session_key:
+                self._session = boto3.Session(
+                    region_name=self.config.aws_region,
+                    profile_name=self.config.aws_profile
+                )
+                self._session_key = session_key
+                self._bedrock_agent_runtime = None
+                self._dynamodb = None
+            return self._session
+    
+    def _max_parallel(self) -> int:
+        """Number of chunks to process concurrently."""
+        return max(1, int(self.config.max_parallel))
+    
+    def _client_config(self) -> Config:
+        """Client configuration with a connection pool sized for the chunk workers."""
+        return Config(
+            max_pool_connections=max(10, self._max_parallel() * 3),
+            retries={'max_attempts': 10, 'mode': 'adaptive'},
+            connect_timeout=10,
+            read_timeout=600,
+            tcp_keepalive=True
+        )
+    
+    @property
+    def bedrock_agent_runtime(self):
+        """Shared Bedrock Agent Runtime client."""
+        with self._client_lock:
+            session = self.session
+            if self._bedrock_agent_runtime is None:
+                self._bedrock_agent_runtime = session.client('bedrock-agent-runtime', config=self._client_config())
+            return self._bedrock_agent_runtime
+    
+    @property
+    def dynamodb(self):
+        """Shared DynamoDB service resource."""
+        with self._client_lock:
+            session = self.session
+            if self._dynamodb is None:
+                self._dynamodb = session.resource('dynamodb', config=self._client_config())
+            return self._dynamodb
+    
+    def _load_json_cached(self, path: str, loader: Callable[[str], Any] = jsonio.load_file) -> Any:
+        """Load a JSON file, reusing the parsed data until the file changes on disk."""
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._json_cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        
+        data = loader(path)
+        self._json_cache[path] = (stamp, data)
+        return data
+    
     def process_manuscript(self, project_name: str, manuscript_file: str, 
                          manuscript_title: str) -> bool:
         """Process manuscript through chunking and assessment."""
@@ -33,45 +198,27 @@ def process_manuscript(self, project_name: str, manuscript_file: str,
         
         logger.info(f"Processing manuscript: {manuscript_title} (Project ID: {project_name})")
         
-        # Run the chunking script
+        # Chunk the manuscript
         logger.info("Chunking manuscript into manageable pieces...")
-        chunk_cmd = [
-            "python3", os.path.join(self.config.TEMP_DIR, "chunk_manuscript.py"),
-            manuscript_copy,
-            "--output_dir", self.config.CHUNKS_DIR,
-            "--project_name", project_name,
-            "--max_tokens", str(self.config.chunk_size),
-            "--overlap_tokens", str(self.config.chunk_overlap)
-        ]
-        
         try:
-            subprocess.run(chunk_cmd, check=True)
-        except subprocess.CalledProcessError as e:
+            metadata = chunking.chunk_manuscript(
+                manuscript_copy,
+                self.config.CHUNKS_DIR,
+                project_name,
+                self.config.chunk_size,
+                self.config.chunk_overlap
+            )
+        except Exception as e:
             logger.error(f"Error during chunking: {str(e)}")
             return False
         
-        # Check if chunking was successful
-        metadata_file = os.path.join(self.config.CHUNKS_DIR, f"{project_name}_metadata.json")
-        if not os.path.isfile(metadata_file):
-            logger.error("Chunking failed. Metadata file not found.")
-            return False
-        
-        # Extract metadata
-        with open(metadata_file, 'r') as f:
-            metadata = json.load(f)
-            total_chunks = metadata.get('total_chunks', 0)
+        total_chunks = metadata.get('total_chunks', 0)
         
         logger.info(f"Manuscript split into {total_chunks} chunks")
         
         # Update DynamoDB with metadata
-        session = boto3.Session(
-            region_name=self.config.aws_region,
-            profile_name=self.config.aws_profile
-        )
-        dynamodb = session.resource('dynamodb')
-        
         state_table = f"{self.config.table_prefix}_{project_name}_state"
-        table = dynamodb.Table(state_table)
+        table = self.dynamodb.Table(state_table)
         
         try:
             table.update_item(
@@ -93,27 +240,20 @@ def process_manuscript(self, project_name: str, manuscript_file: str,
         
         # Run initial manuscript assessment
         logger.info("Performing initial manuscript assessment...")
-        assessment_cmd = [
-            "python3", os.path.join(self.config.TEMP_DIR, "assess_manuscript.py"),
-            "--chunks_dir", self.config.CHUNKS_DIR,
-            "--project_name", project_name,
-            "--region", self.config.aws_region,
-            "--model_id", self.config.default_model,
-            "--table_prefix", self.config.table_prefix
-        ]
-        
         try:
-            subprocess.run(assessment_cmd, check=True)
-        except subprocess.CalledProcessError as e:
+            assessment.assess_manuscript(
+                self.config.CHUNKS_DIR,
+                project_name,
+                self.config.aws_region,
+                self.config.default_model,
+                self.config.table_prefix,
+                chunk_files=metadata.get('chunk_files', []),
+                max_workers=min(self._max_parallel(), assessment.ASSESS_MAX_WORKERS)
+            )
+        except Exception as e:
             logger.error(f"Error during assessment: {str(e)}")
             return False
             
-        # Check if assessment was successful
-        assessment_file = os.path.join(self.config.CHUNKS_DIR, f"{project_name}_assessment.json")
-        if not os.path.isfile(assessment_file):
-            logger.error("Assessment failed. Assessment file not found.")
-            return False
-            
         logger.info("Initial manuscript assessment complete")
         return True
     
@@ -127,8 +267,7 @@ def process_chunks(self, project_name: str) -> bool:
             logger.error(f"Project configuration file not found: {project_config_file}")
             return False
         
-        with open(project_config_file, 'r') as f:
-            project_config = json.load(f)
+        project_config = self._load_json_cached(project_config_file)
         
         # Get metadata
         metadata_file = os.path.join(self.config.CHUNKS_DIR, f"{project_name}_metadata.json")
@@ -136,19 +275,17 @@ def process_chunks(self, project_name: str) -> bool:
             logger.error(f"Metadata file not found: {metadata_file}")
             return False
         
-        with open(metadata_file, 'r') as f:
-            metadata = json.load(f)
-            total_chunks = metadata.get('total_chunks', 0)
-            chunk_files = metadata.get('chunk_files', [])
+        metadata = self._load_json_cached(metadata_file)
+        total_chunks = metadata.get('total_chunks', 0)
+        chunk_files = metadata.get('chunk_files', [])
         
         # Get assessment data
-        assessment_file = os.path.join(self.config.CHUNKS_DIR, f"{project_name}_assessment.json")
-        if not os.path.isfile(assessment_file):
-            logger.error(f"Assessment file not found: {assessment_file}")
+        assessment_file = assessment.find_assessment_file(self.config.CHUNKS_DIR, project_name)
+        if not assessment_file:
+            logger.error(f"Assessment file not found for project {project_name}")
             return False
         
-        with open(assessment_file, 'r') as f:
-            assessment = json.load(f)
+        assessment_data = self._load_json_cached(assessment_file, assessment.load_assessments)
         
         # Extract flow IDs
         flows = project_config.get('flows', {})
@@ -161,7 +298,7 @@ def process_chunks(self, project_name: str) -> bool:
             return False
         
         # Extract improvement focus from assessment
-        content_assessment = assessment.get('content_assessment', {})
+        content_assessment = assessment_data.get('content_assessment', {})
         if isinstance(content_assessment, dict) and 'improvement_recommendations' in content_assessment:
             improvement_focus = ", ".join(content_assessment['improvement_recommendations'])
         else:
@@ -171,70 +308,116 @@ def process_chunks(self, project_name: str) -> bool:
         logger.info(f"Improvement focus: {improvement_focus}")
         
         # Setup parallel processing
-        max_parallel = min(5, multiprocessing.cpu_count())
+        max_parallel = self._max_parallel()
         
         # Create output directory for improved chunks
         improved_dir = os.path.join(self.config.CHUNKS_DIR, f"{project_name}_improved")
         os.makedirs(improved_dir, exist_ok=True)
         
-        # Prepare session for flow invocation
-        session = boto3.Session(
-            region_name=self.config.aws_region,
-            profile_name=self.config.aws_profile
-        )
-        bedrock_agent_runtime = session.client('bedrock-agent-runtime')
+        # Find the chunks still to process
+        pending = []
+        improved_names = self._list_files(improved_dir)
         
-        # Create a pool of workers
-        with multiprocessing.Pool(processes=max_parallel) as pool:
-            # Prepare chunk processing tasks
-            tasks = []
+        for i, chunk_file in enumerate(chunk_files):
+            chunk_id = f"chunk_{i+1:04d}"
             
-            for i, chunk_file in enumerate(chunk_files):
-                chunk_id = f"chunk_{i+1:04d}"
-                improved_file = os.path.join(improved_dir, f"{chunk_id}.txt")
-                
-                # Skip if already processed
-                if os.path.isfile(improved_file):
-                    logger.info(f"Chunk {chunk_id} already processed, skipping...")
-                    continue
-                
-                tasks.append((
-                    project_name, 
-                    chunk_id, 
-                    chunk_file, 
-                    improved_file, 
-                    improvement_focus,
-                    improvement_flow_id,
-                    improvement_alias_id
-                ))
+            # Skip if already processed
+            if f"{chunk_id}.txt" in improved_names:
+                logger.info(f"Chunk {chunk_id} already processed, skipping...")
+                continue
+            
+            pending.append((chunk_id, chunk_file))
+        
+        # Read pending chunks up front so the workers only wait on the network
+        chunk_texts = []
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(16, len(pending))) as reader:
+                chunk_texts = list(reader.map(_read_chunk_file, [chunk_file for _, chunk_file in pending]))
+        
+        # Prepare chunk processing tasks
+        tasks = []
+        
+        for (chunk_id, _), chunk_text in zip(pending, chunk_texts):
+            if chunk_text is None:
+                continue
             
-            # Process chunks in parallel
-            results = pool.starmap(self._process_single_chunk, tasks)
+            tasks.append((
+                project_name, 
+                chunk_id, 
+                chunk_text, 
+                f"{improved_dir}/{chunk_id}.txt", 
+                improvement_focus,
+                improvement_flow_id,
+                improvement_alias_id
+            ))
+        
+        # Process chunks in parallel, recording edits and progress a batch at a time
+        success_count = 0
+        completed = 0
+        edits = []
+        oldest_edit = 0.0
+        unrecorded = []
+        
+        def flush() -> None:
+            # Only chunks whose edits were stored count as processed
+            nonlocal success_count, edits
+            if self._record_edits(project_name, edits):
+                success_count += len(edits)
+            else:
+                unrecorded.extend(edit["edit_id"] for edit in edits)
+            edits = []
+        
+        with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+            running = {executor.submit(self._process_single_chunk, *task) for task in tasks}
+            while running:
+                # Wake on the next finished chunk, or when buffered edits are due to be recorded
+                timeout = None
+                if edits:
+                    timeout = max(0.0, oldest_edit + EDIT_FLUSH_INTERVAL - time.monotonic())
+                done, running = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    completed += 1
+                    edit = future.result()
+                    if edit:
+                        if not edits:
+                            oldest_edit = time.monotonic()
+                        edits.append(edit)
+                        if len(edits) >= EDIT_BATCH_SIZE:
+                            flush()
+                    logger.info(f"Chunk progress: {completed}/{len(tasks)} done, {success_count} recorded")
+                if edits and time.monotonic() - oldest_edit >= EDIT_FLUSH_INTERVAL:
+                    flush()
+        
+        if edits:
+            flush()
+        
+        if unrecorded:
+            logger.error(f"Edits could not be recorded for {len(unrecorded)} chunks: {', '.join(sorted(unrecorded))}")
         
         # Check results
-        success_count = sum(1 for result in results if result)
         logger.info(f"Processed {success_count} chunks successfully out of {len(tasks)}")
         
         # Combine improved chunks into final manuscript
         if success_count > 0:
             final_manuscript = os.path.join(self.config.MANUSCRIPT_DIR, f"{project_name}_improved.txt")
             
-            with open(final_manuscript, 'w') as outfile:
+            improved_names = self._list_files(improved_dir)
+            
+            with open(final_manuscript, 'wb') as outfile:
                 for i in range(len(chunk_files)):
                     chunk_id = f"chunk_{i+1:04d}"
-                    improved_file = os.path.join(improved_dir, f"{chunk_id}.txt")
+                    improved_file = f"{improved_dir}/{chunk_id}.txt"
                     
-                    if os.path.isfile(improved_file):
-                        with open(improved_file, 'r') as infile:
-                            outfile.write(infile.read())
-                        outfile.write("\n\n")
+                    if f"{chunk_id}.txt" in improved_names:
+                        with open(improved_file, 'rb') as infile:
+                            _append_file(infile, outfile)
+                        outfile.write(b"\n\n")
                     else:
                         logger.warning(f"Improved file not found for chunk {chunk_id}")
             
             # Update project state
-            dynamodb = session.resource('dynamodb')
             state_table = f"{self.config.table_prefix}_{project_name}_state"
-            table = dynamodb.Table(state_table)
+            table = self.dynamodb.Table(state_table)
             
             try:
                 table.update_item(
@@ -257,17 +440,18 @@ def process_chunks(self, project_name: str) -> bool:
             logger.error("No chunks were processed successfully")
             return False
     
-    def _process_single_chunk(self, project_name: str, chunk_id: str, chunk_file: str, 
+    def _list_files(self, directory: str) -> Set[str]:
+        """Get the names of the regular files in a directory with one scan."""
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+    
+    def _process_single_chunk(self, project_name: str, chunk_id: str, chunk_text: str, 
                            improved_file: str, improvement_focus: str,
-                           flow_id: str, alias_id: str) -> bool:
-        """Process a single manuscript chunk."""
+                           flow_id: str, alias_id: str) -> Optional[Dict[str, Any]]:
+        """Process a single manuscript chunk and return its edit record."""
         try:
             logger.info(f"Processing chunk {chunk_id}...")
             
-            # Read chunk text
-            with open(chunk_file, 'r') as f:
-                chunk_text = f.read()
-            
             # Prepare flow inputs
             inputs = [
                 {
@@ -283,77 +467,79 @@ def _process_single_chunk(self, project_name: str, chunk_id: str, chunk_file: st
                 }
             ]
             
-            # Create session
-            session = boto3.Session(
-                region_name=self.config.aws_region,
-                profile_name=self.config.aws_profile
-            )
-            bedrock_agent_runtime = session.client('bedrock-agent-runtime')
-            
             # Invoke flow
-            response = bedrock_agent_runtime.invoke_flow(
+            response = self.bedrock_agent_runtime.invoke_flow(
                 flowIdentifier=flow_id,
                 flowAliasIdentifier=alias_id,
                 inputs=inputs
             )
             
-            # Extract results
-            outputs = response.get('outputs', [])
+            # Extract results, stopping as soon as the revision arrives
             final_revision = None
             
-            for output in outputs:
-                if output.get('name') == 'final_revision':
-                    final_revision = output.get('content')
+            for name, content in _iter_flow_outputs(response):
+                if name == 'final_revision':
+                    final_revision = content
                     break
             
             if not final_revision:
                 logger.error(f"No final revision found in flow output for chunk {chunk_id}")
-                return False
-            
-            # Save improved chunk
-            with open(improved_file, 'w') as f:
-                f.write(final_revision)
+                return None
             
-            # Update DynamoDB
-            dynamodb = session.resource('dynamodb')
+            # Save improved chunk as UTF-8, matching the binary read when chunks are combined
+            Path(improved_file).write_bytes(final_revision.encode('utf-8'))
             
-            # Store in edits table
-            edits_table = f"{self.config.table_prefix}_{project_name}_edits"
-            edits_table_resource = dynamodb.Table(edits_table)
-            
-            edits_table_resource.put_item(
-                Item={
-                    "edit_id": chunk_id,
-                    "manuscript_id": project_name,
-                    "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-                    "original_text": chunk_text,
-                    "improved_text": final_revision,
-                    "improvement_type": "content"
-                }
-            )
-            
-            # Update progress
-            state_table = f"{self.config.table_prefix}_{project_name}_state"
-            state_table_resource = dynamodb.Table(state_table)
-            
-            state_table_resource.update_item(
-                Key={
-                    "manuscript_id": project_name,
-                    "chunk_id": "metadata"
-                },
-                UpdateExpression="SET chunks_processed = chunks_processed + :val, updated_at = :u",
-                ExpressionAttributeValues={
-                    ":val": 1,
-                    ":u": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-                }
-            )
+            # Edit record, stored and timestamped by the caller
+            edit = {
+                "edit_id": chunk_id,
+                "manuscript_id": project_name,
+                "original_text": chunk_text,
+                "improved_text": final_revision,
+                "improvement_type": "content"
+            }
             
             logger.info(f"Completed chunk {chunk_id}")
-            return True
+            return edit
             
         except Exception as e:
             logger.error(f"Error processing chunk {chunk_id}: {str(e)}")
-            return False
+            return None
+    
+    def _record_edits(self, project_name: str, edits: List[Dict[str, Any]]) -> bool:
+        """Store chunk edit records and add them to the processed chunk count."""
+        edits_table = self.dynamodb.Table(f"{self.config.table_prefix}_{project_name}_edits")
+        state_table = self.dynamodb.Table(f"{self.config.table_prefix}_{project_name}_state")
+        
+        # One timestamp for the whole batch
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        for edit in edits:
+            edit["timestamp"] = timestamp
+        
+        # Edit records are keyed by chunk, so rewriting them on a retry is harmless
+        for attempt in range(1, EDIT_RECORD_ATTEMPTS + 1):
+            try:
+                with edits_table.batch_writer() as batch:
+                    for edit in edits:
+                        batch.put_item(Item=edit)
+                
+                state_table.update_item(
+                    Key={
+                        "manuscript_id": project_name,
+                        "chunk_id": "metadata"
+                    },
+                    UpdateExpression="ADD chunks_processed :val SET updated_at = :u",
+                    ExpressionAttributeValues={
+                        ":val": len(edits),
+                        ":u": timestamp
+                    }
+                )
+                return True
+            except Exception as e:
+                logger.error(f"Error recording chunk edits (attempt {attempt}/{EDIT_RECORD_ATTEMPTS}): {str(e)}")
+                if attempt < EDIT_RECORD_ATTEMPTS:
+                    time.sleep(2 ** attempt)
+        
+        return False
     
     def finalize_manuscript(self, project_name: str) -> bool:
         """Finalize manuscript."""
@@ -365,8 +551,7 @@ def finalize_manuscript(self, project_name: str) -> bool:
             logger.error(f"Project configuration file not found: {project_config_file}")
             return False
         
-        with open(project_config_file, 'r') as f:
-            project_config = json.load(f)
+        project_config = self._load_json_cached(project_config_file)
         
         # Get manuscript title and final manuscript
         title = project_config.get('title', project_name)
@@ -377,13 +562,12 @@ def finalize_manuscript(self, project_name: str) -> bool:
             return False
         
         # Get assessment data
-        assessment_file = os.path.join(self.config.CHUNKS_DIR, f"{project_name}_assessment.json")
-        if not os.path.isfile(assessment_file):
-            logger.error(f"Assessment file not found: {assessment_file}")
+        assessment_file = assessment.find_assessment_file(self.config.CHUNKS_DIR, project_name)
+        if not assessment_file:
+            logger.error(f"Assessment file not found for project {project_name}")
             return False
         
-        with open(assessment_file, 'r') as f:
-            assessment = json.load(f)
+        assessment_data = self._load_json_cached(assessment_file, assessment.load_assessments)
         
         # Extract flow IDs
         flows = project_config.get('flows', {})
@@ -396,99 +580,64 @@ def finalize_manuscript(self, project_name: str) -> bool:
             return False
         
         # Need to process manuscript in chunks for finalization too
-        chunk_size = 20000  # Characters, not tokens for this step
+        chunk_size = 20000  # Bytes, not tokens for this step
         
-        with open(final_manuscript, 'r') as f:
-            full_text = f.read()
-            
-        total_size = len(full_text)
-        num_chunks = (total_size + chunk_size - 1) // chunk_size
+        # Split manuscript into chunks straight from the page cache
+        chunks = []
+        if os.path.getsize(final_manuscript) > 0:
+            with open(final_manuscript, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    chunks = _split_utf8(mm, chunk_size)
         
+        num_chunks = len(chunks)
         logger.info(f"Splitting manuscript into {num_chunks} chunks for final review")
         
         # Create finalization directory
         final_dir = os.path.join(self.config.CHUNKS_DIR, f"{project_name}_final")
         os.makedirs(final_dir, exist_ok=True)
         
-        # Split manuscript into chunks
-        chunks = []
-        for i in range(num_chunks):
-            start = i * chunk_size
-            end = min((i + 1) * chunk_size, total_size)
-            chunks.append(full_text[start:end])
-        
         # Get previous assessment
-        content_assessment = json.dumps(assessment.get('content_assessment', {}))
+        content_assessment = jsonio.dumps(assessment_data.get('content_assessment', {})).decode('utf-8')
+        
+        chunk_ids = [f"final_chunk_{i+1:04d}" for i in range(num_chunks)]
+        
+        # Finalize chunks in parallel, keeping results in manuscript order, while
+        # the chunks are saved to files for reference in the background
+        max_parallel = max(1, min(self._max_parallel(), num_chunks))
+        with ThreadPoolExecutor(max_workers=2) as writer, \
+                ThreadPoolExecutor(max_workers=max_parallel) as executor:
+            reference_writes = [
+                writer.submit(Path(final_dir, chunk_id).write_text, chunk_text, encoding='utf-8')
+                for chunk_id, chunk_text in zip(chunk_ids, chunks)
+            ]
+            futures = [
+                executor.submit(
+                    self._finalize_single_chunk, project_name, title, chunk_id, chunk_text,
+                    content_assessment, finalization_flow_id, finalization_alias_id
+                )
+                for chunk_id, chunk_text in zip(chunk_ids, chunks)
+            ]
+            results = [future.result() for future in futures]
         
-        # Create session
-        session = boto3.Session(
-            region_name=self.config.aws_region,
-            profile_name=self.config.aws_profile
-        )
-        bedrock_agent_runtime = session.client('bedrock-agent-runtime')
+        for chunk_id, write in zip(chunk_ids, reference_writes):
+            if write.exception():
+                logger.warning(f"Could not save reference copy of chunk {chunk_id}: {str(write.exception())}")
         
-        # Process each chunk for finalization
         final_outputs = []
         summaries = []
         
-        for i, chunk_text in enumerate(chunks):
-            chunk_id = f"final_chunk_{i+1:04d}"
-            logger.info(f"Finalizing chunk {chunk_id}")
-            
-            # Save chunk to file for reference
-            chunk_file = os.path.join(final_dir, chunk_id)
-            with open(chunk_file, 'w') as f:
-                f.write(chunk_text)
-            
-            # Prepare flow inputs
-            inputs = [
-                {
-                    "content": {
-                        "manuscript_id": project_name,
-                        "title": title,
-                        "final_text": chunk_text,
-                        "previous_assessment": content_assessment
-                    },
-                    "nodeName": "FlowInputNode",
-                    "nodeOutputNames": ["manuscript_id", "title", "final_text", "previous_assessment"]
-                }
-            ]
-            
-            # Invoke flow
-            try:
-                response = bedrock_agent_runtime.invoke_flow(
-                    flowIdentifier=finalization_flow_id,
-                    flowAliasIdentifier=finalization_alias_id,
-                    inputs=inputs
-                )
+        for chunk_id, (final_polished, executive_summary) in zip(chunk_ids, results):
+            if final_polished:
+                final_outputs.append(final_polished)
                 
-                # Extract results
-                outputs = response.get('outputs', [])
-                final_polished = None
-                executive_summary = None
-                
-                for output in outputs:
-                    if output.get('name') == 'final_polished_text':
-                        final_polished = output.get('content')
-                    elif output.get('name') == 'executive_summary':
-                        executive_summary = output.get('content')
-                
-                if final_polished:
-                    final_outputs.append(final_polished)
-                    
-                    # Save polished chunk
-                    with open(f"{chunk_file}_polished.txt", 'w') as f:
-                        f.write(final_polished)
+                # Save polished chunk
+                Path(f"{final_dir}/{chunk_id}_polished.txt").write_bytes(final_polished.encode('utf-8'))
+            
+            if executive_summary:
+                summaries.append(executive_summary)
                 
-                if executive_summary:
-                    summaries.append(executive_summary)
-                    
-                    # Save executive summary
-                    with open(os.path.join(final_dir, f"executive_summary_{chunk_id}.txt"), 'w') as f:
-                        f.write(executive_summary)
-                        
-            except Exception as e:
-                logger.error(f"Error finalizing chunk {chunk_id}: {str(e)}")
+                # Save executive summary
+                Path(f"{final_dir}/executive_summary_{chunk_id}.txt").write_bytes(executive_summary.encode('utf-8'))
         
         # Combine finalized chunks into final manuscript
         bestseller_manuscript = os.path.join(self.config.MANUSCRIPT_DIR, f"{project_name}_bestseller.txt")
@@ -505,9 +654,8 @@ def finalize_manuscript(self, project_name: str) -> bool:
                 f.write("\n\n" + "-" * 80 + "\n\n")
         
         # Update project state
-        dynamodb = session.resource('dynamodb')
         state_table = f"{self.config.table_prefix}_{project_name}_state"
-        table = dynamodb.Table(state_table)
+        table = self.dynamodb.Table(state_table)
         
         try:
             table.update_item(
@@ -529,25 +677,67 @@ def finalize_manuscript(self, project_name: str) -> bool:
         
         return True
     
+    def _finalize_single_chunk(self, project_name: str, title: str, chunk_id: str,
+                               chunk_text: str, previous_assessment: str,
+                               flow_id: str, alias_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """Run a single chunk through the finalization flow."""
+        logger.info(f"Finalizing chunk {chunk_id}")
+        
+        # Prepare flow inputs
+        inputs = [
+            {
+                "content": {
+                    "manuscript_id": project_name,
+                    "title": title,
+                    "final_text": chunk_text,
+                    "previous_assessment": previous_assessment
+                },
+                "nodeName": "FlowInputNode",
+                "nodeOutputNames": ["manuscript_id", "title", "final_text", "previous_assessment"]
+            }
+        ]
+        
+        final_polished = None
+        executive_summary = None
+        
+        # Invoke flow
+        try:
+            response = self.bedrock_agent_runtime.invoke_flow(
+                flowIdentifier=flow_id,
+                flowAliasIdentifier=alias_id,
+                inputs=inputs
+            )
+            
+            # Extract results
+            for name, content in _iter_flow_outputs(response):
+                if name == 'final_polished_text':
+                    final_polished = content
+                elif name == 'executive_summary':
+                    executive_summary = content
+                if final_polished and executive_summary:
+                    break
+                    
+        except Exception as e:
+            logger.error(f"Error finalizing chunk {chunk_id}: {str(e)}")
+        
+        return final_polished, executive_summary
+    
     def get_chunk_text(self, project_name: str, chunk_id: str) -> Optional[str]:
         """Get text for a specific chunk."""
         # Try improved chunks first
-        improved_dir = os.path.join(self.config.CHUNKS_DIR, f"{project_name}_improved")
-        improved_file = os.path.join(improved_dir, f"{chunk_id}.txt")
+        improved_file = Path(self.config.CHUNKS_DIR, f"{project_name}_improved", f"{chunk_id}.txt")
         
-        if os.path.isfile(improved_file):
-            with open(improved_file, 'r') as f:
-                return f.read()
+        if improved_file.is_file():
+            return improved_file.read_bytes().decode('utf-8')
         
         # Try to find in original chunks
         metadata_file = os.path.join(self.config.CHUNKS_DIR, f"{project_name}_metadata.json")
         
         if os.path.isfile(metadata_file):
-            with open(metadata_file, 'r') as f:
-                metadata = json.load(f)
+            metadata = self._load_json_cached(metadata_file)
                 
             # Extract chunk number
-            match = re.search(r'chunk_0*(\d+)', chunk_id)
+            match = _CHUNK_NUM_RE.search(chunk_id)
             if match:
                 chunk_num = int(match.group(1))
                 chunk_files = metadata.get('chunk_files', [])
@@ -562,220 +752,36 @@ def get_chunk_text(self, project_name: str, chunk_id: str) -> Optional[str]:
         logger.warning(f"Could not find text for chunk {chunk_id}")
         return None
     
-    def _generate_chunking_script(self) -> None:
-        """Generate Python script for manuscript chunking."""
-        script_path = os.path.join(self.config.TEMP_DIR, "chunk_manuscript.py")
-        
-        if os.path.isfile(script_path):
-            return
-            
-        script_content = r'''#!/usr/bin/env python3
-import os
-import sys
-import json
-import re
-import tiktoken
-import nltk
-from nltk.tokenize import sent_tokenize
-import argparse
-
-def count_tokens(text: str, encoding_name: str = "cl100k_base") -> int:
-    """Count the number of tokens in a text string."""
-    encoding = tiktoken.get_encoding(encoding_name)
-    return len(encoding.encode(text))
-
-def chunk_text(text, max_tokens=8000, overlap_tokens=500):
-    """Split text into chunks of approximately max_tokens with overlap."""
-    sentences = sent_tokenize(text)
-    chunks = []
-    current_chunk = []
-    current_token_count = 0
-    
-    for sentence in sentences:
-        sentence_token_count = count_tokens(sentence)
-        if current_token_count + sentence_token_count > max_tokens and current_chunk:
-            chunks.append(" ".join(current_chunk))
-            overlap_text = []
-            overlap_token_count = 0
-            for i in range(len(current_chunk) - 1, -1, -1):
-                sentence_for_overlap = current_chunk[i]
-                sentence_overlap_tokens = count_tokens(sentence_for_overlap)
-                if overlap_token_count + sentence_overlap_tokens <= overlap_tokens:
-                    overlap_text.insert(0, sentence_for_overlap)
-                    overlap_token_count += sentence_overlap_tokens
-                else:
-                    break
-            current_chunk = overlap_text
-            current_token_count = overlap_token_count
-        current_chunk.append(sentence)
-        current_token_count += sentence_token_count
-    
-    if current_chunk:
-        chunks.append(" ".join(current_chunk))
-    return chunks
-
-def detect_chapters(text):
-    """Identify chapter breaks in the text."""
-    chapter_patterns = [
-        r'(?i)^chapter\s+\d+',
-        r'(?i)^chapter\s+[IVXLCDM]+',
-        r'(?i)^\d+\.\s+',
-        r'(?m)^\s*CHAPTER\s+(?:\d+|[IVXLCDM]+)'
-    ]
-    chapter_matches = []
-    for pattern in chapter_patterns:
-        matches = re.finditer(pattern, text, re.MULTILINE)
-        for match in matches:
-            chapter_matches.append((match.start(), match.group()))
-    chapter_matches.sort()
-    return chapter_matches
-
-def save_chunks(chunks, output_dir, project_name):
-    """Save chunks to individual files."""
-    os.makedirs(output_dir, exist_ok=True)
-    chunk_files = []
-    
-    for i, chunk in enumerate(chunks):
-        file_path = os.path.join(output_dir, f"{project_name}_chunk_{i+1:04d}.txt")
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(chunk)
-        chunk_files.append(file_path)
-    
-    metadata = {
-        "project_name": project_name,
-        "total_chunks": len(chunks),
-        "chunk_files": chunk_files,
-        "token_counts": [count_tokens(chunk) for chunk in chunks]
-    }
-    
-    with open(os.path.join(output_dir, f"{project_name}_metadata.json"), "w", encoding="utf-8") as f:
-        json.dump(metadata, f, indent=2)
-    
-    return metadata
+    def _install_script(self, source_path: str, script_path: str, mode: int = 0o755) -> bool:
+        """Copy module source to a script created with the given mode, unless an identical copy exists.
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Split manuscript into chunks for processing")
-    parser.add_argument("manuscript_path", help="Path to manuscript file")
-    parser.add_argument("--output_dir", default="./chunks", help="Directory to save chunks")
-    parser.add_argument("--project_name", required=True, help="Project name")
-    parser.add_argument("--max_tokens", type=int, default=8000, help="Maximum tokens per chunk")
-    parser.add_argument("--overlap_tokens", type=int, default=500, help="Token overlap between chunks")
-    
-    args = parser.parse_args()
-    
-    try:
-        with open("./config.json", "r", encoding="utf-8") as f:
-            config = json.load(f)
-            max_tokens = config.get("chunk_size", args.max_tokens)
-            overlap_tokens = config.get("chunk_overlap", args.overlap_tokens)
-    except:
-        max_tokens = args.max_tokens
-        overlap_tokens = args.overlap_tokens
-    
-    try:
-        nltk.data.find("tokenizers/punkt")
-    except LookupError:
-        nltk.download("punkt")
-    
-    with open(args.manuscript_path, "r", encoding="utf-8") as f:
-        manuscript_text = f.read()
+        Returns True when the script was written or replaced.
+        """
+        if os.path.isfile(script_path) and filecmp.cmp(source_path, script_path, shallow=False):
+            return False
+        fd = os.open(script_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+        with open(fd, 'wb') as dst, open(source_path, 'rb') as src:
+            shutil.copyfileobj(src, dst)
+        return True
     
-    text_chunks = chunk_text(manuscript_text, max_tokens, overlap_tokens)
-    metadata = save_chunks(text_chunks, args.output_dir, args.project_name)
+    def _install_helpers(self) -> None:
+        """Copy the modules the standalone scripts import next to them."""
+        self._install_script(jsonio.__file__, os.path.join(self.config.TEMP_DIR, "jsonio.py"), 0o644)
     
-    print(f"Manuscript split into {len(text_chunks)} chunks. Metadata saved.")
-    print(json.dumps(metadata))
-'''
-
-        with open(script_path, "w", encoding="utf-8") as f:
-            f.write(script_content)
-            
-        os.chmod(script_path, 0o755)
-        logger.info(f"Chunking script generated: {script_path}")
+    def _generate_chunking_script(self) -> None:
+        """Generate standalone Python script for manuscript chunking."""
+        script_path = os.path.join(self.config.TEMP_DIR, "chunk_manuscript.py")
+        
+        # Stale copies from an older version are replaced
+        self._install_helpers()
+        if self._install_script(chunking.__file__, script_path):
+            logger.info(f"Chunking script generated: {script_path}")
 
     def _generate_assessment_script(self) -> None:
-        """Generate Python script for manuscript assessment."""
+        """Generate standalone Python script for manuscript assessment."""
         script_path = os.path.join(self.config.TEMP_DIR, "assess_manuscript.py")
         
-        if os.path.isfile(script_path):
-            return
-            
-        script_content = r'''#!/usr/bin/env python3
-import os
-import sys
-import json
-import boto3
-import argparse
-from datetime import datetime
-
-def assess_chunk(chunk_text: str, model_id: str, region: str) -> str:
-    """Assess a single chunk of text using a specified model."""
-    session = boto3.Session(region_name=region)
-    bedrock = session.client("bedrock")
-    response = bedrock.invoke_model(
-        modelId=model_id,
-        contentType="text/plain",
-        content=chunk_text
-    )
-    return response["body"].read().decode("utf-8")
-
-def main():
-    """Main entry point for manuscript assessment script."""
-    parser = argparse.ArgumentParser(description="Assess manuscript chunks")
-    parser.add_argument("--chunks_dir", required=True, help="Directory containing manuscript chunks")
-    parser.add_argument("--project_name", required=True, help="Project name")
-    parser.add_argument("--region", required=True, help="AWS region")
-    parser.add_argument("--model_id", required=True, help="Model ID for assessment")
-    parser.add_argument("--table_prefix", required=True, help="DynamoDB table prefix")
-    
-    args = parser.parse_args()
-    
-    metadata_file = os.path.join(args.chunks_dir, f"{args.project_name}_metadata.json")
-    with open(metadata_file, "r", encoding="utf-8") as f:
-        metadata = json.load(f)
-    
-    chunk_files = metadata["chunk_files"]
-    assessments = []
-    
-    for chunk_file in chunk_files:
-        with open(chunk_file, "r", encoding="utf-8") as f:
-            chunk_text = f.read()
-        assessment = assess_chunk(chunk_text, args.model_id, args.region)
-        assessments.append(assessment)
-    
-    assessment_file = os.path.join(args.chunks_dir, f"{args.project_name}_assessment.json")
-    with open(assessment_file, "w", encoding="utf-8") as f:
-        json.dump(assessments, f, indent=2)
-    
-    session = boto3.Session(region_name=args.region)
-    dynamodb = session.resource("dynamodb")
-    state_table = f"{args.table_prefix}_{args.project_name}_state"
-    table = dynamodb.Table(state_table)
-    
-    try:
-        table.update_item(
-            Key={
-                "manuscript_id": args.project_name,
-                "chunk_id": "metadata"
-            },
-            UpdateExpression="SET current_phase = :p, updated_at = :u",
-            ExpressionAttributeValues={
-                ":p": "improvement",
-                ":u": datetime.utcnow().isoformat()
-            }
-        )
-    except Exception as e:
-        print(f"Error updating DynamoDB: {str(e)}")
-        sys.exit(1)
-    
-    print("Manuscript assessment complete")
-
-if __name__ == "__main__":
-    main()
-'''
-        
-        with open(script_path, "w", encoding="utf-8") as f:
-            f.write(script_content)
-            
-        os.chmod(script_path, 0o755)
-        logger.info(f"Assessment script generated: {script_path}")
+        # Stale copies from an older version are replaced
+        self._install_helpers()
+        if self._install_script(assessment.__file__, script_path):
+            logger.info(f"Assessment script generated: {script_path}")
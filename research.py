@@ -6,11 +6,36 @@
 import boto3
 import requests
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, List, Any, Optional, Tuple
 
 logger = logging.getLogger("storybook.research")
 
+# Pages fetched concurrently during research
+MAX_FETCH_WORKERS = 8
+
+# Most of a page read for content extraction, in bytes
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+
+# Characters not allowed in research file names
+_FILENAME_UNSAFE_RE = re.compile(r'[\\/*?:"<>|]')
+
+# Target URL inside a DuckDuckGo redirect link
+_UDDG_RE = re.compile(r'uddg=([^&]+)')
+
+# Runs of whitespace, newlines included
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Use the lxml C parser when it is installed
+try:
+    import lxml  # pylint: disable=unused-import
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
 class ResearchManager:
     """Manages research capabilities for the storybook application."""
     
@@ -23,6 +48,20 @@ def __init__(self, config) -> None:
         """
         self.config = config
         
+        # Pooled HTTP session shared by search and page fetches
+        self._http = requests.Session()
+        self._http.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept-Encoding': 'gzip, deflate'
+        })
+        adapter = HTTPAdapter(
+            pool_connections=MAX_FETCH_WORKERS,
+            pool_maxsize=MAX_FETCH_WORKERS,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        )
+        self._http.mount('http://', adapter)
+        self._http.mount('https://', adapter)
+        
         # Generate necessary Python scripts
         self._generate_research_script()
     
@@ -53,11 +92,16 @@ def conduct_research(self, project_name: str, research_topic: str,
             logger.error(f"Search error: {search_results['error']}")
             return False
         
-        # Extract content from each result
+        # Extract content from all results concurrently
+        results = search_results.get("results", [])
+        extracted = []
+        if results:
+            with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(results))) as executor:
+                extracted = list(executor.map(self._extract_content, [result['url'] for result in results]))
+        
         sources = []
-        for result in search_results.get("results", []):
+        for result, content_data in zip(results, extracted):
             logger.info(f"Processing: {result['title']}")
-            content_data = self._extract_content(result['url'])
             
             if "error" not in content_data:
                 # Summarize content if needed
@@ -76,7 +120,7 @@ def conduct_research(self, project_name: str, research_topic: str,
         
         # Save to file
         research_id = f"{project_name}_{int(time.time())}"
-        research_filename = re.sub(r'[\\/*?:"<>|]', "_", f"{project_name}_{research_topic[:30]}.json")
+        research_filename = _FILENAME_UNSAFE_RE.sub("_", f"{project_name}_{research_topic[:30]}.json")
         research_path = os.path.join(self.config.RESEARCH_DIR, research_filename)
         
         with open(research_path, 'w', encoding='utf-8') as f:
@@ -195,19 +239,15 @@ def _search_web(self, query: str, max_results: int = 5) -> Dict[str, Any]:
         Returns:
             Dict[str, Any]: Search results or error information
         """
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
         try:
             # Using DuckDuckGo HTML search as a simple approach
             encoded_query = query.replace(' ', '+')
-            response = requests.get(f'https://html.duckduckgo.com/html/?q={encoded_query}', headers=headers)
+            response = self._http.get(f'https://html.duckduckgo.com/html/?q={encoded_query}')
             
             if response.status_code != 200:
                 return {"error": f"Search failed with status {response.status_code}"}
                 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.text, HTML_PARSER)
             results = []
             
             # Extract search results
@@ -223,7 +263,7 @@ def _search_web(self, query: str, max_results: int = 5) -> Dict[str, Any]:
                     
                     # Clean up URL if it's from DuckDuckGo's redirect
                     if '/d.js' in url:
-                        url_match = re.search(r'uddg=([^&]+)', url)
+                        url_match = _UDDG_RE.search(url)
                         if url_match:
                             url = requests.utils.unquote(url_match.group(1))
                     
@@ -248,16 +288,20 @@ def _extract_content(self, url: str) -> Dict[str, Any]:
         Returns:
             Dict[str, Any]: Extracted content or error information
         """
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code != 200:
-                return {"error": f"Failed to retrieve content: Status {response.status_code}"}
+            # Stream the body so oversized or non-HTML responses are never fully downloaded
+            with self._http.get(url, timeout=(3, 10), stream=True) as response:
+                if response.status_code != 200:
+                    return {"error": f"Failed to retrieve content: Status {response.status_code}"}
+                
+                content_type = response.headers.get('Content-Type', '')
+                if content_type and 'html' not in content_type:
+                    return {"error": f"Unsupported content type: {content_type}"}
+                
+                body = response.raw.read(MAX_PAGE_BYTES, decode_content=True)
+                encoding = response.encoding
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(body, HTML_PARSER, from_encoding=encoding)
             
             # Remove unwanted elements
             for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside']):
@@ -275,10 +319,8 @@ def _extract_content(self, url: str) -> Dict[str, Any]:
                 # Fallback to body content
                 content = soup.get_text(separator='\n')
             
-            # Clean up the content
-            content = re.sub(r'\n+', '\n', content)
-            content = re.sub(r'\s+', ' ', content)
-            content = content.strip()
+            # Clean up the content; \s covers newlines, so one pass collapses all whitespace
+            content = _WHITESPACE_RE.sub(' ', content).strip()
             
             return {
                 "title": title,
@@ -303,14 +345,13 @@ def _summarize_content(self, content: str, max_length: int = 2000) -> str:
         if len(content) <= max_length:
             return content
         
-        # Find a sentence boundary near max_length
-        truncated = content[:max_length]
-        last_period = truncated.rfind('.')
+        # Find a sentence boundary near max_length without copying the prefix first
+        last_period = content.rfind('.', 0, max_length)
         
         if last_period > 0:
             return content[:last_period + 1]
         else:
-            return truncated
+            return content[:max_length]
     
     def _generate_research_script(self) -> None:
         """Generate Python script for web research."""
@@ -319,7 +360,7 @@ def _generate_research_script(self) -> None:
         if os.path.isfile(script_path):
             return
             
-        script_content = """#!/usr/bin/env python3
+        script_content = r"""#!/usr/bin/env python3
 import os
 import re
 import json
@@ -68,15 +68,11 @@ def extract_content(url: str) -> Dict[str, Any]:
         main_content = soup.find('main') or soup.find('article') or soup.find('div', class_='content')
         
         if main_content:
-            content = main_content.get_text(separator='
-')
+            content = main_content.get_text(separator='\n')
         else:
-            content = soup.get_text(separator='
-')
+            content = soup.get_text(separator='\n')
         
-        content = re.sub(r'
-+', '
-', content)
+        content = re.sub(r'\n+', '\n', content)
         content = re.sub(r'\s+', ' ', content)
         content = content.strip()
         
@@ -127,7 +123,7 @@ def main():
         "summary": f"Research on '{query}' found {len(sources)} sources."
     }
     
-    research_filename = re.sub(r'[\/*?:"<>|]', "_", f"{query[:30]}.json")
+    research_filename = re.sub(r'[\\/*?:"<>|]', "_", f"{query[:30]}.json")
     research_path = os.path.join(".", research_filename)
     
     with open(research_path, 'w', encoding='utf-8') as f:
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+import chunking
+
+def reference_ranges(counts, max_tokens, overlap_tokens):
+    """The sentence-by-sentence windowing loop _chunk_ranges replaced, as (start, end, tokens)."""
+    ranges = []
+    start = 0
+    current = []
+    for i, count in enumerate(counts):
+        if sum(counts[j] for j in current) + count > max_tokens and current:
+            ranges.append((start, i, sum(counts[j] for j in current)))
+            overlap = []
+            for j in reversed(current):
+                if sum(counts[k] for k in overlap) + counts[j] <= overlap_tokens:
+                    overlap.insert(0, j)
+                else:
+                    break
+            current = overlap
+            start = overlap[0] if overlap else i
+        current.append(i)
+    if current:
+        ranges.append((start, len(counts), sum(counts[j] for j in current)))
+    return ranges
+
+@pytest.fixture
+def stub_counts(monkeypatch):
+    """Make each sentence "s<i>" count as counts[i] tokens."""
+    def install(counts):
+        monkeypatch.setattr(chunking, "count_tokens_batch",
+                            lambda texts: [counts[int(text[1:])] for text in texts])
+        return [f"s{i}" for i in range(len(counts))]
+    return install
+
+def test_chunk_ranges_overlap(stub_counts):
+    sentences = stub_counts([4, 4, 4, 4, 4])
+    assert chunking._chunk_ranges(sentences, 10, 4) == [(0, 2, 8), (1, 3, 8), (2, 4, 8), (3, 5, 8)]
+
+def test_chunk_ranges_oversized_sentence(stub_counts):
+    sentences = stub_counts([3, 20, 3])
+    assert chunking._chunk_ranges(sentences, 10, 5) == [(0, 1, 3), (0, 2, 23), (2, 3, 3)]
+
+def test_chunk_ranges_match_reference(stub_counts):
+    rng = random.Random(0)
+    for _ in range(500):
+        counts = [rng.randint(1, 40) for _ in range(rng.randint(1, 60))]
+        max_tokens = rng.randint(1, 120)
+        overlap_tokens = rng.randint(0, max_tokens)
+        sentences = stub_counts(counts)
+        expected = reference_ranges(counts, max_tokens, overlap_tokens)
+        assert chunking._chunk_ranges(sentences, max_tokens, overlap_tokens) == expected
@@ -0,0 +1,36 @@
+import mmap
+import random
+
+import pytest
+
+pytest.importorskip("boto3")
+
+import manuscript
+
+ALPHABET = "ab .\néß€中\U0001f600"
+
+def test_split_utf8_round_trips_without_splitting_characters():
+    rng = random.Random(0)
+    for _ in range(500):
+        text = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 200)))
+        data = text.encode("utf-8")
+        size = rng.randint(1, 40)
+        pieces = manuscript._split_utf8(data, size)
+        assert "".join(pieces) == text
+        for piece in pieces:
+            assert piece
+            assert "�" not in piece
+            # A piece only outgrows size when one character is wider than size
+            assert len(piece.encode("utf-8")) <= max(size, 4)
+
+def test_split_utf8_prefers_paragraph_then_sentence_breaks():
+    data = b"aaaa. bbb\n\ncc dddd"
+    assert manuscript._split_utf8(data, 12) == ["aaaa. bbb\n\n", "cc dddd"]
+    data = b"aaaa bbb. cc dddd"
+    assert manuscript._split_utf8(data, 12) == ["aaaa bbb. ", "cc dddd"]
+
+def test_split_utf8_reads_mmap(tmp_path):
+    path = tmp_path / "manuscript.txt"
+    path.write_bytes("été. été\n\nfin".encode("utf-8"))
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        assert "".join(manuscript._split_utf8(mm, 5)) == "été. été\n\nfin"
@@ -1,81 +1,92 @@
 import pytest
-import ast
-import os
 import codecs
-import re
+import io
+import tokenize
+from pathlib import Path
+
+def read_source(file_path):
+    """Read a file's raw bytes for the checks."""
+    return Path(file_path).read_bytes()
 
 def check_syntax(file_path):
-    with open(file_path, "r") as file:
-        source = file.read()
+    source = read_source(file_path)
     try:
-        ast.parse(source)
+        # Compile straight to bytecode; no Python-level AST objects are built
+        compile(source, file_path, "exec", dont_inherit=True)
         return True
     except SyntaxError:
         return False
 
-def test_main_syntax():
-    assert check_syntax("main.py"), "Syntax error in main.py"
-
-def test_flows_syntax():
-    assert check_syntax("flows.py"), "Syntax error in flows.py"
+PYTHON_FILES = ["main.py", "flows.py", "iam.py", "manuscript.py",
+                "research.py", "config.py", "dynamo.py", "chunking.py",
+                "assessment.py", "jsonio.py"]
 
-def test_iam_syntax():
-    assert check_syntax("iam.py"), "Syntax error in iam.py"
+@pytest.mark.parametrize("path", PYTHON_FILES, ids=PYTHON_FILES)
+def test_syntax(path):
+    assert check_syntax(path), f"Syntax error in {path}"
 
-def test_manuscript_syntax():
-    assert check_syntax("manuscript.py"), "Syntax error in manuscript.py"
+# Characters that may follow a backslash in a non-raw literal; bytes have no \N, \u or \U
+STR_ESCAPE_CHARS = frozenset('\r\n\\\'"abfnrtv01234567xNuU')
+BYTES_ESCAPE_CHARS = STR_ESCAPE_CHARS - frozenset('NuU')
 
-def test_research_syntax():
-    assert check_syntax("research.py"), "Syntax error in research.py"
+# Python 3.12+ lexes f-strings into start/middle/end tokens instead of one STRING
+FSTRING_START = getattr(tokenize, 'FSTRING_START', None)
+FSTRING_MIDDLE = getattr(tokenize, 'FSTRING_MIDDLE', None)
+FSTRING_END = getattr(tokenize, 'FSTRING_END', None)
 
-def test_config_syntax():
-    assert check_syntax("config.py"), "Syntax error in config.py"
+def _escapes_ok(text, prefix, start=0):
+    prefix = prefix.lower()
+    if 'r' in prefix:
+        return True
+    valid = BYTES_ESCAPE_CHARS if 'b' in prefix else STR_ESCAPE_CHARS
+    # Jump from backslash to backslash; an escaped backslash is skipped with its escape
+    pos = text.find('\\', start)
+    while pos != -1:
+        if text[pos + 1:pos + 2] not in valid:
+            return False
+        pos = text.find('\\', pos + 2)
+    return True
 
-def test_dynamo_syntax():
-    assert check_syntax("dynamo.py"), "Syntax error in dynamo.py"
+def _literal_escapes_ok(literal):
+    quote = min(i for i in (literal.find("'"), literal.find('"')) if i >= 0)
+    return _escapes_ok(literal, literal[:quote], quote)
 
 def check_escape_sequences(file_path):
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-        
-        # List of valid escape sequences in Python
-        valid_escapes = [
-            r'\\', r'\a', r'\b', r'\f', r'\n', r'\r', r'\t', r'\v',
-            r'\N{', r'\u', r'\U', r'\x'
-        ]
-        
-        # Find all escape sequences in the file
-        escapes = re.findall(r'\\[^\\](?:[^\\\s])*', content)
-        
-        # Check each escape sequence
-        for escape in escapes:
-            # Skip if it's a valid escape sequence
-            if any(escape.startswith(valid) for valid in valid_escapes):
+        source = read_source(file_path)
+        source.decode('utf-8')
+        # Without a backslash there is no escape to check
+        if b'\\' not in source:
+            return True
+        # One lexer pass; only string literals can hold escape sequences
+        fstring_prefixes = []
+        for token in tokenize.tokenize(io.BytesIO(source).readline):
+            if token.type == tokenize.STRING:
+                ok = _literal_escapes_ok(token.string)
+            elif token.type == FSTRING_START:
+                fstring_prefixes.append(token.string.rstrip('\'"'))
                 continue
-            # Skip if it's inside a raw string (r"..." or r'...')
-            if re.search(r'r["\'].*' + re.escape(escape) + r'.*["\']', content):
+            elif token.type == FSTRING_MIDDLE:
+                ok = _escapes_ok(token.string, fstring_prefixes[-1])
+            elif token.type == FSTRING_END:
+                fstring_prefixes.pop()
                 continue
-            return False
+            else:
+                continue
+            if not ok:
+                return False
         return True
-            
-    except UnicodeDecodeError:
+    except (UnicodeDecodeError, SyntaxError, tokenize.TokenError):
         return False
 
 def check_file_encoding(file_path):
     try:
         # Try to detect BOM
-        with open(file_path, 'rb') as file:
-            raw = file.read(4)
-            if raw.startswith(codecs.BOM_UTF8):
-                return False
-        return True
+        return not read_source(file_path).startswith(codecs.BOM_UTF8)
     except Exception:
         return False
 
-def test_escape_sequences():
-    python_files = ["main.py", "flows.py", "iam.py", "manuscript.py", 
-                    "research.py", "config.py", "dynamo.py"]
-    for file in python_files:
-        assert check_escape_sequences(file), f"Invalid escape sequence found in {file}"
-        assert check_file_encoding(file), f"Invalid file encoding or BOM found in {file}"
+@pytest.mark.parametrize("path", PYTHON_FILES, ids=PYTHON_FILES)
+def test_escape_sequences(path):
+    assert check_escape_sequences(path), f"Invalid escape sequence found in {path}"
+    assert check_file_encoding(path), f"Invalid file encoding or BOM found in {path}"